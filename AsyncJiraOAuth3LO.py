@@ -0,0 +1,101 @@
+import asyncio
+import httpx
+import logging
+import time
+
+from JiraOAuth3LO import JiraOAuth3LO, _check, _json_loads
+
+logger = logging.getLogger(__name__)
+
+# httpx has no urllib3 Retry, so GETs are backed off here with the same policy the sync session uses
+_RETRY_STATUSES = frozenset((429, 502, 503, 504))
+_MAX_RETRIES = 5
+_BACKOFF_FACTOR = 0.25
+
+def _retry_delay(response, attempt):
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return int(retry_after)
+    return _BACKOFF_FACTOR * (2 ** attempt)
+
+class AsyncJiraOAuth3LO(JiraOAuth3LO):
+    __slots__ = ('_aio_client', '_aio_loop')
+
+    def __init__(self, client_id, client_secret, redirect_uri, redis_client=None, redis_host='localhost', redis_port=6379, redis_db=0, session=None):
+        super().__init__(client_id, client_secret, redirect_uri, redis_client, redis_host, redis_port, redis_db, session)
+        self._aio_client = None
+        self._aio_loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+        self.close()
+
+    def _get_aio_client(self):
+        # Async clients are bound to the running event loop, so create the client lazily inside it.
+        # HTTP/2 multiplexes a whole gathered batch over one TLS connection instead of one socket per request.
+        # A client left over from an earlier asyncio.run() belongs to a closed loop and is simply dropped.
+        loop = asyncio.get_running_loop()
+        if self._aio_client is None or self._aio_client.is_closed or self._aio_loop is not loop:
+            self._aio_loop = loop
+            self._aio_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=20),
+                timeout=30.0,
+                headers={"Accept": "application/json"}
+            )
+        return self._aio_client
+
+    async def aclose(self):
+        client, self._aio_client = self._aio_client, None
+        # A client from a finished loop cannot be closed from this one; its connections died with that loop
+        if client is not None and not client.is_closed and self._aio_loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    async def _get(self, client, url, headers):
+        for attempt in range(_MAX_RETRIES):
+            response = await client.get(url, headers=headers)
+            if response.status_code not in _RETRY_STATUSES:
+                return response
+            await asyncio.sleep(_retry_delay(response, attempt))
+        return await client.get(url, headers=headers)
+
+    async def _get_ticket(self, client, api_base, headers, ticket_id):
+        # Mirrors _authed_request: backoff on rate limits, one retry with a renewed token after a 401, and DEBUG timing
+        started = time.perf_counter() if logger.isEnabledFor(logging.DEBUG) else None
+        response = await self._get(client, f"{api_base}issue/{ticket_id}", headers)
+        if response.status_code == 401:
+            rejected = headers["Authorization"].removeprefix("Bearer ")
+            if await asyncio.to_thread(self._renew_token, rejected):
+                api_base, headers = await asyncio.to_thread(self._prepare_request)
+                response = await self._get(client, f"{api_base}issue/{ticket_id}", headers)
+        if started is not None:
+            logger.debug("Jira GET issue/%s -> %s in %.1f ms", ticket_id, response.status_code, (time.perf_counter() - started) * 1000)
+        return _json_loads(_check(response).content)
+
+    async def get_ticket_async(self, ticket_id):
+        # Token and cloud_id lookups block on Redis and HTTP, so they run off the event loop
+        api_base, headers = await asyncio.to_thread(self._prepare_request)
+        return await self._get_ticket(self._get_aio_client(), api_base, headers, ticket_id)
+
+    async def get_tickets_bulk(self, ticket_ids, max_concurrency=8):
+        # Token and cloud_id are resolved once for the whole batch, then the requests run concurrently;
+        # the semaphore keeps large batches from tripping Jira's rate limit
+        api_base, headers = await asyncio.to_thread(self._prepare_request)
+        client = self._get_aio_client()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(ticket_id):
+            async with semaphore:
+                return await self._get_ticket(client, api_base, headers, ticket_id)
+        return await asyncio.gather(*(fetch(ticket_id) for ticket_id in ticket_ids))
+
+    def get_tickets_bulk_sync(self, ticket_ids, max_concurrency=8):
+        async def run():
+            try:
+                return await self.get_tickets_bulk(ticket_ids, max_concurrency)
+            finally:
+                await self.aclose()
+        return asyncio.run(run())
@@ -1,30 +1,241 @@
 import os
+import re
+import random
+import time
 import requests
 import redis
 import logging
+import threading
+import uuid
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    # orjson is a speed-up only; fall back to the stdlib encoder with the same compact bytes output
+    import json
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Library module: handlers and levels are left to the application
+logger.addHandler(logging.NullHandler())
 
 # Atlassian base URLs
 ATLASSIAN_AUTH_BASE_URL = "https://auth.atlassian.com"
 ATLASSIAN_API_BASE_URL = "https://api.atlassian.com"
 
+_MENTION_RE = re.compile(r'@([\w.\-]+)')
+
+def _adf_mentions(adf, mentions):
+    # Iterative walk over ADF child nodes; mentions are always reachable through 'content'
+    stack = deque([adf])
+    while stack:
+        node = stack.pop()
+        t = type(node)
+        if t is dict:
+            if node.get('type') == 'mention':
+                attrs = node.get('attrs')
+                if attrs:
+                    mentions.add(attrs.get('text'))
+            content = node.get('content')
+            if content:
+                stack.extend(content)
+        elif t is list:
+            stack.extend(node)
+    return mentions
+
+def _text_mentions(text, mentions):
+    mentions.update(_MENTION_RE.findall(text))
+    return mentions
+
+# Bodies are plain dicts (ADF) or strs straight from the JSON decoder, so an exact type lookup replaces isinstance chains
+_MENTION_HANDLERS = {
+    dict: _adf_mentions,
+    str: _text_mentions
+}
+
+# Every field extract_user_data reads; only tickets carrying all of them are memoized
+_USER_DATA_FIELDS = ('assignee', 'reporter', 'description', 'comment')
+
+# Plain-text comments are wrapped in a fixed ADF document, pre-encoded around the single text value
+_COMMENT_ADF_PREFIX, _COMMENT_ADF_SUFFIX = _json_dumps({
+    "body": {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": None}
+                ]
+            }
+        ]
+    }
+}).split(b"null")
+
+# Atomically return a still-valid token or take the refresh lock, so concurrent workers never refresh twice.
+# The hash outlives the access token (it carries the refresh token), so validity is judged on expires_at.
+_GET_OR_LOCK_LUA = """
+local expires_at = redis.call('HGET', KEYS[1], 'expires_at')
+if expires_at and tonumber(expires_at) > tonumber(ARGV[3]) then return redis.call('HGETALL', KEYS[1]) end
+if redis.call('SET', KEYS[2], ARGV[2], 'NX', 'EX', ARGV[1]) then return 'LOCK' end
+return 'WAIT'
+"""
+
+# Atlassian rotating refresh tokens lapse after 90 days without use
+_REFRESH_TOKEN_TTL = 90 * 24 * 3600
+
+# (connect, read) seconds for token endpoint calls. A refresh runs under the 30s refresh lock, so with the
+# auth adapter's two connect retries the worst case (3 x 3.05 + 10) has to stay below _refresh_lock_ttl.
+_AUTH_TIMEOUT = (3.05, 10)
+
+# Delete the refresh lock only while it still holds this worker's token, never one taken after our TTL ran out
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+class JiraAPIError(Exception):
+    def __init__(self, status_code, body):
+        super().__init__(f"Jira API returned {status_code}: {body}")
+        self.status_code = status_code
+        self.body = body
+
+def _check(response):
+    # Plain range test on the success path; the body is only read once the call has failed
+    if 200 <= response.status_code < 300:
+        return response
+    raise JiraAPIError(response.status_code, response.text)
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+# Process-wide Redis connection pools, shared by every instance that does not pass its own redis_client
+_DEFAULT_POOLS = {}
+_DEFAULT_POOLS_LOCK = threading.Lock()
+
+def _get_default_pool(host, port, db):
+    key = (host, port, db)
+    with _DEFAULT_POOLS_LOCK:
+        pool = _DEFAULT_POOLS.get(key)
+        if pool is None:
+            pool = redis.ConnectionPool(host=host, port=port, db=db, max_connections=32, decode_responses=True)
+            _DEFAULT_POOLS[key] = pool
+        return pool
+
+class _JiraRetry(Retry):
+    # POST is not idempotent: a replayed create_ticket/add_comment can duplicate the write, and an
+    # authorization code is single-use, so POSTs are only resent when Jira explicitly asks for it
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == "POST":
+            return bool(self.total and has_retry_after and status_code in (429, 503))
+        return super().is_retry(method, status_code, has_retry_after)
+
+def _refresh_loop(client_ref, stop):
+    # Holds the client only weakly, so an instance nobody closes can still be garbage-collected
+    while not stop.is_set():
+        client = client_ref()
+        if client is None:
+            return
+        delay = client._seconds_until_refresh()
+        if delay is None:
+            delay = 60
+        elif delay <= 0:
+            try:
+                client._refresh_with_lock()
+            except Exception as e:
+                logger.warning("Background token refresh failed: %s", e)
+            delay = 30
+        del client
+        stop.wait(delay)
+
 class JiraAuthBase:
-    def __init__(self, client_id, client_secret, redirect_uri, redis_client=None, redis_host='localhost', redis_port=6379, redis_db=0):
+    # One instance per tenant adds up; slots drop the per-instance __dict__
+    __slots__ = (
+        'client_id', 'client_secret', 'redirect_uri', 'redis_client', 'token_key', 'env_token',
+        '_owns_session', '_session', '_refresh_skew', '_token_cache', '_refresh_lock_key',
+        '_refresh_lock_ttl', '_get_or_lock', '_release_lock_script', '_stop_refresh', '_refresher',
+        '_refresher_lock', '__weakref__'
+    )
+
+    def __init__(self, client_id, client_secret, redirect_uri, redis_client=None, redis_host='localhost', redis_port=6379, redis_db=0, session=None):
         self.client_id = client_id
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
         if redis_client is not None:
             self.redis_client = redis_client
         else:
-            self.redis_client = redis.StrictRedis(host=redis_host, port=redis_port, db=redis_db, decode_responses=True)
+            # Production callers should pass their own redis_client; the fallback shares one pool per Redis server
+            self.redis_client = redis.StrictRedis(connection_pool=_get_default_pool(redis_host, redis_port, redis_db))
         self.token_key = "jira_oauth_token"
         self.env_token = os.environ.get("JIRA_AUTH_TOKEN")
+        # An injected session is used as configured and left open for its owner to close
+        self._owns_session = session is None
+        self._session = self._build_session() if session is None else session
+        # Refresh 5 minutes before expiry, jittered by +/-10% per instance so workers do not all renew at once
+        self._refresh_skew = int(300 * random.uniform(0.9, 1.1))
+        self._token_cache = None
+        self._refresh_lock_key = "jira_oauth_refresh_lock"
+        self._refresh_lock_ttl = 30
+        self._get_or_lock = self.redis_client.register_script(_GET_OR_LOCK_LUA)
+        self._release_lock_script = self.redis_client.register_script(_RELEASE_LOCK_LUA)
+        self._stop_refresh = threading.Event()
+        # Started with the first token, once construction has finished
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._stop_refresh.set()
+        if self._owns_session:
+            self._session.close()
+
+    def _build_session(self):
+        # One pooled, keep-alive session per instance so repeated calls skip the TCP/TLS handshake
+        session = requests.Session()
+        # Constant headers live on the session; requests add only Authorization, and Content-Type when sending a body
+        session.headers.update({"Accept": "application/json"})
+        # Rate limits and gateway errors are retried with backoff inside urllib3, honouring Retry-After;
+        # once retries run out the last response is returned so _check still reports it.
+        # POST stays out of allowed_methods, so read errors on writes are never replayed (see _JiraRetry).
+        retries = _JiraRetry(
+            total=5,
+            backoff_factor=0.25,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        session.mount(ATLASSIAN_API_BASE_URL, HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries))
+        # Token calls only retry failed connects: a sent refresh token may already be spent, and a Retry-After
+        # sleep could outlast the refresh lock, letting another worker replay the same refresh token
+        auth_retries = Retry(
+            total=2,
+            read=0,
+            status=0,
+            backoff_factor=0.25,
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        session.mount(ATLASSIAN_AUTH_BASE_URL, HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=auth_retries))
+        return session
 
     def call_token_api(self, code):
         url = f"{ATLASSIAN_AUTH_BASE_URL}/oauth/token"
-        headers = {"Content-Type": "application/json"}
         data = {
             "grant_type": "authorization_code",
             "client_id": self.client_id,
@@ -32,335 +243,405 @@ class JiraAuthBase:
             "code": code,
             "redirect_uri": self.redirect_uri
         }
-        try:
-            response = requests.post(url, json=data, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to exchange code for token: {e}")
-            raise Exception(f"Failed to exchange code for token: {e}")
+        return _check(self._session.post(url, json=data, timeout=_AUTH_TIMEOUT)).json()
 
     def refresh_token(self):
+        # Read directly: the refresh token is still needed once the access token has expired
         try:
-            token_data = self.load_token()
-            if not token_data or 'refresh_token' not in token_data:
-                raise Exception("No refresh token available.")
-            url = f"{ATLASSIAN_AUTH_BASE_URL}/oauth/token"
-            headers = {"Content-Type": "application/json"}
-            data = {
-                "grant_type": "refresh_token",
-                "client_id": self.client_id,
-                "client_secret": self.client_secret,
-                "refresh_token": token_data['refresh_token'],
-            }
-            response = requests.post(url, json=data, headers=headers)
-            response.raise_for_status()
-            token_response = response.json()
-            self.cache_token_to_redis(token_response, token_response.get('expires_in', 3600))
-            return token_response
-        except Exception as e:
-            logger.error(f"Failed to refresh token: {e}")
-            raise Exception(f"Failed to refresh token: {e}")
+            refresh_token = self.redis_client.hget(self.token_key, 'refresh_token')
+        except redis.ResponseError:
+            self._migrate_legacy_token()
+            refresh_token = self.redis_client.hget(self.token_key, 'refresh_token')
+        if not refresh_token:
+            raise Exception("No refresh token available.")
+        url = f"{ATLASSIAN_AUTH_BASE_URL}/oauth/token"
+        data = {
+            "grant_type": "refresh_token",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "refresh_token": _decode(refresh_token),
+        }
+        token_response = _check(self._session.post(url, json=data, timeout=_AUTH_TIMEOUT)).json()
+        token_response.setdefault('refresh_token', data['refresh_token'])
+        self.cache_token_to_redis(token_response, token_response.get('expires_in', 3600))
+        return token_response
 
-    def load_token(self):
+    def _seconds_until_refresh(self):
         try:
-            token_data = self.redis_client.get(self.token_key)
-            if token_data:
-                import json
-                token_data = json.loads(token_data)
-                from time import time
-                if token_data.get('expires_at', 0) > time():
-                    return token_data
+            expires_at, refresh_token = self.redis_client.hmget(self.token_key, 'expires_at', 'refresh_token')
+            if expires_at and refresh_token:
+                return int(expires_at) - self._refresh_skew - time.time()
+        except Exception:
+            pass
+        return None
+
+    def _start_refresher(self):
+        # Renew the token shortly before it expires so get_token never blocks on the auth server
+        with self._refresher_lock:
+            if self._refresher is not None or self._stop_refresh.is_set():
+                return
+            self._refresher = threading.Thread(target=_refresh_loop, args=(weakref.ref(self), self._stop_refresh), daemon=True)
+            self._refresher.start()
+        weakref.finalize(self, self._stop_refresh.set)
+
+    def _release_lock(self, lock_token):
+        self._release_lock_script(keys=[self._refresh_lock_key], args=[lock_token])
+
+    def _refresh_with_lock(self):
+        # Only one process refreshes; the others keep serving the still-valid token
+        lock_token = uuid.uuid4().hex
+        if not self.redis_client.set(self._refresh_lock_key, lock_token, nx=True, ex=self._refresh_lock_ttl):
             return None
+        try:
+            return self.refresh_token()
+        finally:
+            self._release_lock(lock_token)
+
+    def _parse_token(self, token_data):
+        if token_data:
+            if isinstance(token_data, list):
+                # HGETALL replies from Lua arrive as a flat [field, value, ...] list
+                token_data = dict(zip(token_data[::2], token_data[1::2]))
+            token_data = {_decode(field): _decode(value) for field, value in token_data.items()}
+            token_data['expires_at'] = int(token_data.get('expires_at', 0))
+            if token_data['expires_at'] > time.time():
+                return token_data
+        return None
+
+    def _read_token(self):
+        return self.redis_client.hgetall(self.token_key)
+
+    def load_token(self):
+        try:
+            try:
+                token_data = self._read_token()
+            except redis.ResponseError:
+                # Tokens cached by earlier releases are JSON strings; convert once to the hash layout
+                self._migrate_legacy_token()
+                token_data = self._read_token()
+            return self._parse_token(token_data)
         except Exception as e:
-            logger.error(f"Failed to load token from Redis: {e}")
+            logger.error("Failed to load token from Redis: %s", e)
             return None
 
+    def _migrate_legacy_token(self):
+        legacy = self.redis_client.get(self.token_key)
+        ttl = self.redis_client.ttl(self.token_key)
+        if legacy and ttl > 0:
+            self._write_token(_json_loads(legacy), ttl)
+        else:
+            self.redis_client.delete(self.token_key)
+
+    def _write_token(self, token, expiry):
+        # Every key written alongside the token goes out in one pipelined round-trip; MULTI/EXEC makes the
+        # DEL + HSET + EXPIRE replacement atomic, so readers never see the hash missing mid-write
+        pipe = self.redis_client.pipeline(transaction=True)
+        self._queue_token_write(pipe, token, expiry)
+        pipe.execute()
+
+    def _queue_token_write(self, pipe, token, expiry):
+        # Stored as a hash so readers can fetch single fields; with a refresh token inside, the hash is
+        # kept past the access token's expiry and readers check expires_at instead
+        pipe.delete(self.token_key)
+        pipe.hset(self.token_key, mapping={field: value for field, value in token.items() if value is not None})
+        pipe.expire(self.token_key, _REFRESH_TOKEN_TTL if token.get('refresh_token') else expiry)
+
     def cache_token_to_redis(self, token, expiry):
-        try:
-            import json
-            from time import time
-            token['expires_at'] = int(time()) + int(expiry)
-            self.redis_client.set(self.token_key, json.dumps(token), ex=expiry)
-        except Exception as e:
-            logger.error(f"Failed to cache token to Redis: {e}")
-            raise Exception(f"Failed to cache token to Redis: {e}")
+        token['expires_at'] = int(time.time()) + int(expiry)
+        self._write_token(token, expiry)
+        self._remember_token(token)
+
+    def _remember_token(self, token_data):
+        self._token_cache = (token_data['access_token'], token_data.get('expires_at', 0))
+        if self._refresher is None:
+            self._start_refresher()
 
     def get_token(self, code=None):
-        try:
-            token_data = self.load_token()
-            if token_data:
-                return token_data['access_token']
-            elif code:
-                token_response = self.call_token_api(code)
-                self.cache_token_to_redis(token_response, token_response.get('expires_in', 3600))
-                return token_response['access_token']
-            else:
-                token_response = self.refresh_token()
-                return token_response['access_token']
-        except Exception as e:
-            logger.error(f"Failed to get token: {e}")
-            raise Exception(f"Failed to get token: {e}")
+        # In-process copy is trusted until the background refresher would renew it, so the hot path skips Redis
+        token_cache = self._token_cache
+        if code is None and token_cache and token_cache[1] - self._refresh_skew > time.time():
+            return token_cache[0]
+        token_data = self.load_token()
+        if token_data:
+            self._remember_token(token_data)
+            return token_data['access_token']
+        elif code:
+            token_response = self.call_token_api(code)
+            self.cache_token_to_redis(token_response, token_response.get('expires_in', 3600))
+            return token_response['access_token']
+        else:
+            return self._refresh_or_wait()
+
+    def _refresh_or_wait(self, rejected=None):
+        # Each EVALSHA either returns a token another worker just cached or elects this worker to refresh;
+        # waiters re-run it, so a refresher that fails is replaced as soon as its lock is released.
+        # A token Jira has already rejected counts as missing: renew it, or wait for whoever is renewing it.
+        deadline = time.time() + self._refresh_lock_ttl
+        while True:
+            lock_token = uuid.uuid4().hex
+            outcome = _decode(self._get_or_lock(
+                keys=[self.token_key, self._refresh_lock_key],
+                args=[self._refresh_lock_ttl, lock_token, int(time.time())]
+            ))
+            if outcome == 'LOCK':
+                try:
+                    return self.refresh_token()['access_token']
+                finally:
+                    self._release_lock(lock_token)
+            if outcome != 'WAIT':
+                token_data = self._parse_token(outcome)
+                if token_data and token_data['access_token'] != rejected:
+                    self._remember_token(token_data)
+                    return token_data['access_token']
+                if token_data:
+                    token_response = self._refresh_with_lock()
+                    if token_response is not None:
+                        return token_response['access_token']
+            if time.time() >= deadline:
+                raise Exception("Timed out waiting for another worker to refresh the token.")
+            time.sleep(0.2)
 
 class JiraOAuth3LO(JiraAuthBase):
-    def __init__(self, client_id, client_secret, redirect_uri, redis_client=None, redis_host='localhost', redis_port=6379, redis_db=0):
-        super().__init__(client_id, client_secret, redirect_uri, redis_client, redis_host, redis_port, redis_db)
+    __slots__ = (
+        'cloud_id', 'cloud_id_key', '_access_token', '_auth_headers', '_auth_json_headers',
+        '_api_cloud_id', '_api_base', '_user_data_cache', '_user_data_cache_size', '_user_data_lock'
+    )
+
+    def __init__(self, client_id, client_secret, redirect_uri, redis_client=None, redis_host='localhost', redis_port=6379, redis_db=0, session=None):
+        super().__init__(client_id, client_secret, redirect_uri, redis_client, redis_host, redis_port, redis_db, session)
         self.cloud_id = None
+        self.cloud_id_key = "jira_cloud_id"
+        self._access_token = None
+        self._auth_headers = None
+        self._auth_json_headers = None
+        self._api_cloud_id = None
+        self._api_base = None
+        self._user_data_cache = OrderedDict()
+        self._user_data_cache_size = 1024
+        self._user_data_lock = threading.Lock()
+
+    def _load_session_state(self):
+        # Token hash and cloud_id come back in a single pipelined round-trip
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hgetall(self.token_key)
+        pipe.get(self.cloud_id_key)
+        token_data, cloud_id = pipe.execute()
+        return token_data, _decode(cloud_id)
+
+    def _read_token(self):
+        token_data, cloud_id = self._load_session_state()
+        if cloud_id and not self.cloud_id:
+            self.cloud_id = cloud_id
+        return token_data
+
+    def _queue_token_write(self, pipe, token, expiry):
+        super()._queue_token_write(pipe, token, expiry)
+        if self.cloud_id:
+            pipe.set(self.cloud_id_key, self.cloud_id)
+
+    def _cache_cloud_id(self):
+        # cloud_id is stable per tenant, so it is stored without a TTL and shared by every worker
+        try:
+            self.redis_client.set(self.cloud_id_key, self.cloud_id)
+        except Exception as e:
+            logger.error("Failed to cache cloud_id to Redis: %s", e)
 
     def get_accessible_resources(self, access_token):
         url = f"{ATLASSIAN_API_BASE_URL}/oauth/token/accessible-resources"
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json"
-        }
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            resources = response.json()
-            if resources and isinstance(resources, list) and 'id' in resources[0]:
-                self.cloud_id = resources[0]['id']
-            return resources
-        except requests.RequestException as e:
-            logger.error(f"Failed to get accessible resources: {e}")
-            raise Exception(f"Failed to get accessible resources: {e}")
+        headers = {"Authorization": f"Bearer {access_token}"}
+        resources = _check(self._session.get(url, headers=headers)).json()
+        if resources and isinstance(resources, list) and 'id' in resources[0]:
+            self.cloud_id = resources[0]['id']
+            self._cache_cloud_id()
+        return resources
 
-    def create_ticket(self, data):
+    def _ensure_cloud_id(self, access_token):
+        if self.cloud_id:
+            return self.cloud_id
         try:
-            access_token = self.get_token()
-            if not self.cloud_id:
-                resources = self.get_accessible_resources(access_token)
-                if resources and isinstance(resources, list) and 'id' in resources[0]:
-                    self.cloud_id = resources[0]['id']
-                else:
-                    raise Exception("Could not determine Jira cloud_id.")
-            url = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{self.cloud_id}/rest/api/3/issue"
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            }
-            response = requests.post(url, json=data, headers=headers)
-            if response.status_code == 400:
-                print("Jira API 400 Bad Request:", response.text)
-            response.raise_for_status()
-            return response.json()
+            cloud_id = self.redis_client.get(self.cloud_id_key)
         except Exception as e:
-            logger.error(f"Failed to create Jira ticket: {e}")
-            raise Exception(f"Failed to create Jira ticket: {e}")
+            logger.error("Failed to load cloud_id from Redis: %s", e)
+            cloud_id = None
+        if cloud_id:
+            self.cloud_id = _decode(cloud_id)
+            return self.cloud_id
+        self.get_accessible_resources(access_token)
+        if not self.cloud_id:
+            raise Exception("Could not determine Jira cloud_id.")
+        return self.cloud_id
 
-    def update_ticket(self, ticket_id, data):
+    def _prepare_request(self):
+        access_token = self.get_token()
+        cloud_id = self._ensure_cloud_id(access_token)
+        # Rebuild the cached header and base URL only when the token or cloud_id actually changes
+        if access_token != self._access_token:
+            # Accept comes from the session; Content-Type is only sent with a body
+            self._auth_headers = {"Authorization": f"Bearer {access_token}"}
+            self._auth_json_headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
+            self._access_token = access_token
+        if cloud_id != self._api_cloud_id:
+            self._api_base = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{cloud_id}/rest/api/3/"
+            self._api_cloud_id = cloud_id
+        return self._api_base, self._auth_headers
+
+    def _send(self, method, path, data, params):
+        api_base, headers = self._prepare_request()
+        if data is not None:
+            headers = self._auth_json_headers
+        return self._session.request(method, api_base + path, data=data, params=params, headers=headers)
+
+    def _renew_token(self, rejected):
+        # After a 401 retry only with a different token: one rotated by another worker, a forced refresh,
+        # or the one a concurrent refresher (e.g. a sibling in a fan-out batch) is about to store
+        self._token_cache = None
         try:
-            access_token = self.get_token()
-            if not self.cloud_id:
-                resources = self.get_accessible_resources(access_token)
-                if resources and isinstance(resources, list) and 'id' in resources[0]:
-                    self.cloud_id = resources[0]['id']
-                else:
-                    raise Exception("Could not determine Jira cloud_id.")
-            url = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{self.cloud_id}/rest/api/3/issue/{ticket_id}"
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            }
-            response = requests.put(url, json=data, headers=headers)
-            response.raise_for_status()
-            return response.status_code == 204
+            return self._refresh_or_wait(rejected) != rejected
         except Exception as e:
-            logger.error(f"Failed to update Jira ticket: {e}")
-            raise Exception(f"Failed to update Jira ticket: {e}")
+            logger.warning("Could not renew the rejected token: %s", e)
+            return False
+
+    def _authed_request(self, method, path, json=None, params=None, data=None):
+        # Bodies are encoded once, which also keeps them ready for a retry
+        if json is not None:
+            data = _json_dumps(json)
+        # Every Jira API call funnels through here, so this is the one place that times them
+        started = time.perf_counter() if logger.isEnabledFor(logging.DEBUG) else None
+        response = self._send(method, path, data, params)
+        if response.status_code == 401 and self._renew_token(self._access_token):
+            response = self._send(method, path, data, params)
+        if started is not None:
+            logger.debug("Jira %s %s -> %s in %.1f ms", method, path, response.status_code, (time.perf_counter() - started) * 1000)
+        return response
+
+    def create_ticket(self, data):
+        # A 400 surfaces as JiraAPIError with Jira's validation messages in .body
+        return _check(self._authed_request("POST", "issue", json=data)).json()
+
+    def update_ticket(self, ticket_id, data):
+        response = self._authed_request("PUT", f"issue/{ticket_id}", json=data)
+        self._forget_user_data(ticket_id)
+        return _check(response).status_code == 204
 
     def delete_ticket(self, ticket_id):
-        try:
-            access_token = self.get_token()
-            if not self.cloud_id:
-                resources = self.get_accessible_resources(access_token)
-                if resources and isinstance(resources, list) and 'id' in resources[0]:
-                    self.cloud_id = resources[0]['id']
-                else:
-                    raise Exception("Could not determine Jira cloud_id.")
-            url = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{self.cloud_id}/rest/api/3/issue/{ticket_id}"
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json"
-            }
-            response = requests.delete(url, headers=headers)
-            response.raise_for_status()
-            return response.status_code == 204
-        except Exception as e:
-            logger.error(f"Failed to delete Jira ticket: {e}")
-            raise Exception(f"Failed to delete Jira ticket: {e}")
+        return _check(self._authed_request("DELETE", f"issue/{ticket_id}")).status_code == 204
 
     def get_ticket(self, ticket_id):
-        try:
-            access_token = self.get_token()
-            if not self.cloud_id:
-                resources = self.get_accessible_resources(access_token)
-                if resources and isinstance(resources, list) and 'id' in resources[0]:
-                    self.cloud_id = resources[0]['id']
-                else:
-                    raise Exception("Could not determine Jira cloud_id.")
-            url = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{self.cloud_id}/rest/api/3/issue/{ticket_id}"
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json"
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to get Jira ticket: {e}")
-            raise Exception(f"Failed to get Jira ticket: {e}")
+        return _json_loads(_check(self._authed_request("GET", f"issue/{ticket_id}")).content)
 
-    def list_tickets(self, project_key, jql=None):
-        try:
-            access_token = self.get_token()
-            if not self.cloud_id:
-                resources = self.get_accessible_resources(access_token)
-                if resources and isinstance(resources, list) and 'id' in resources[0]:
-                    self.cloud_id = resources[0]['id']
-                else:
-                    raise Exception("Could not determine Jira cloud_id.")
-            url = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{self.cloud_id}/rest/api/3/search"
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json"
-            }
-            if jql is None:
-                jql = f'project={project_key}'
-            params = {"jql": jql}
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json().get('issues', [])
-        except Exception as e:
-            logger.error(f"Failed to list Jira tickets: {e}")
-            raise Exception(f"Failed to list Jira tickets: {e}")
+    def _fan_out(self, fn, items, max_workers):
+        # Resolve token and cloud_id once so the workers all start from the warm in-process cache
+        self._prepare_request()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fn, items))
+
+    def get_tickets(self, ticket_ids, max_workers=8):
+        return self._fan_out(self.get_ticket, ticket_ids, max_workers)
+
+    def _search(self, project_key, jql, fields, max_results, start_at):
+        if jql is None:
+            jql = f'project={project_key}'
+        params = {"jql": jql, "maxResults": max_results, "startAt": start_at}
+        if fields:
+            # Restricting fields (e.g. ("summary", "status")) shrinks the response considerably
+            params["fields"] = fields if isinstance(fields, str) else ",".join(fields)
+        return _json_loads(_check(self._authed_request("GET", "search", params=params)).content)
+
+    def list_tickets(self, project_key, jql=None, fields=None, max_results=100, start_at=0):
+        return self._search(project_key, jql, fields, max_results, start_at).get('issues', [])
+
+    def iter_tickets(self, project_key, jql=None, fields=None, max_results=100):
+        start_at = 0
+        while True:
+            page = self._search(project_key, jql, fields, max_results, start_at)
+            issues = page.get('issues', [])
+            if not issues:
+                return
+            yield issues
+            start_at += len(issues)
+            # Stop on the reported total instead of paying for a trailing empty page
+            if 'total' in page and start_at >= page['total']:
+                return
 
     def list_projects(self):
-        try:
-            access_token = self.get_token()
-            if not self.cloud_id:
-                resources = self.get_accessible_resources(access_token)
-                if resources and isinstance(resources, list) and 'id' in resources[0]:
-                    self.cloud_id = resources[0]['id']
-                else:
-                    raise Exception("Could not determine Jira cloud_id.")
-            url = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{self.cloud_id}/rest/api/3/project/search"
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json"
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json().get('values', [])
-        except Exception as e:
-            logger.error(f"Failed to list Jira projects: {e}")
-            raise Exception(f"Failed to list Jira projects: {e}")
+        return _json_loads(_check(self._authed_request("GET", "project/search")).content).get('values', [])
+
+    @staticmethod
+    def extract_mentions_adf(adf, mentions=None):
+        return _adf_mentions(adf, set() if mentions is None else mentions)
+
+    def _forget_user_data(self, ticket_id):
+        ticket_id = str(ticket_id)
+        with self._user_data_lock:
+            for key in [key for key in self._user_data_cache if ticket_id in (key[0], key[1])]:
+                del self._user_data_cache[key]
 
     def extract_user_data(self, ticket):
+        # id/key + fields.updated acts as a cheap ETag; an edited ticket gets a new entry.
+        # Projected tickets (fields=...) are not cached, as their result says nothing about the full ticket.
+        fields = ticket.get('fields') or {}
+        updated = fields.get('updated')
+        ticket_id = ticket.get('id')
+        ticket_key = ticket.get('key')
+        cache_key = None
+        if updated and (ticket_id or ticket_key) and all(name in fields for name in _USER_DATA_FIELDS):
+            cache_key = (ticket_id, ticket_key, updated)
+        if cache_key is not None:
+            with self._user_data_lock:
+                cached = self._user_data_cache.get(cache_key)
+                if cached is not None:
+                    self._user_data_cache.move_to_end(cache_key)
+                    return {**cached, 'mentions': list(cached['mentions'])}
+        user_data = self._extract_user_data(ticket)
+        if cache_key is not None:
+            with self._user_data_lock:
+                self._user_data_cache[cache_key] = {**user_data, 'mentions': list(user_data['mentions'])}
+                if len(self._user_data_cache) > self._user_data_cache_size:
+                    self._user_data_cache.popitem(last=False)
+        return user_data
+
+    def _extract_user_data(self, ticket):
         user_data = {
             'assignee': None,
             'reporter': None,
             'mentions': set()
         }
-        try:
-            fields = ticket.get('fields', {})
-            assignee = fields.get('assignee')
-            if assignee:
-                user_data['assignee'] = assignee.get('displayName') or assignee.get('name')
-            reporter = fields.get('reporter')
-            if reporter:
-                user_data['reporter'] = reporter.get('displayName') or reporter.get('name')
-            description = fields.get('description', '')
-            import re
-            if isinstance(description, dict) and 'content' in description:
-                def extract_mentions_adf(adf):
-                    mentions = set()
-                    if isinstance(adf, dict):
-                        if adf.get('type') == 'mention' and 'attrs' in adf:
-                            mentions.add(adf['attrs'].get('text'))
-                        for v in adf.values():
-                            if isinstance(v, (dict, list)):
-                                mentions.update(extract_mentions_adf(v))
-                    elif isinstance(adf, list):
-                        for item in adf:
-                            mentions.update(extract_mentions_adf(item))
-                    return mentions
-                user_data['mentions'].update(extract_mentions_adf(description))
-            elif isinstance(description, str):
-                user_data['mentions'].update(re.findall(r'@([\w.\-]+)', description))
-            comments = fields.get('comment', {}).get('comments', [])
-            for comment in comments:
-                body = comment.get('body', '')
-                if isinstance(body, dict):
-                    user_data['mentions'].update(extract_mentions_adf(body))
-                elif isinstance(body, str):
-                    user_data['mentions'].update(re.findall(r'@([\w.\-]+)', body))
-            user_data['mentions'] = list(user_data['mentions'])
-            return user_data
-        except Exception as e:
-            logger.error(f"Failed to extract user data: {e}")
-            raise Exception(f"Failed to extract user data: {e}")
+        fields = ticket.get('fields', {})
+        assignee = fields.get('assignee')
+        if assignee:
+            user_data['assignee'] = assignee.get('displayName') or assignee.get('name')
+        reporter = fields.get('reporter')
+        if reporter:
+            user_data['reporter'] = reporter.get('displayName') or reporter.get('name')
+        handlers = _MENTION_HANDLERS
+        mentions = user_data['mentions']
+        description = fields.get('description', '')
+        handler = handlers.get(type(description))
+        if handler:
+            handler(description, mentions)
+        comments = fields.get('comment', {}).get('comments', [])
+        for comment in comments:
+            body = comment.get('body', '')
+            handler = handlers.get(type(body))
+            if handler:
+                handler(body, mentions)
+        user_data['mentions'] = list(user_data['mentions'])
+        return user_data
 
     def add_comment(self, ticket_id, comment):
-        try:
-            access_token = self.get_token()
-            if not self.cloud_id:
-                resources = self.get_accessible_resources(access_token)
-                if resources and isinstance(resources, list) and 'id' in resources[0]:
-                    self.cloud_id = resources[0]['id']
-                else:
-                    raise Exception("Could not determine Jira cloud_id.")
-            url = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{self.cloud_id}/rest/api/3/issue/{ticket_id}/comment"
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            }
-            if isinstance(comment, str):
-                comment_body = {
-                    "body": {
-                        "type": "doc",
-                        "version": 1,
-                        "content": [
-                            {
-                                "type": "paragraph",
-                                "content": [
-                                    {"type": "text", "text": comment}
-                                ]
-                            }
-                        ]
-                    }
-                }
-            else:
-                comment_body = {"body": comment}
-            response = requests.post(url, json=comment_body, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Failed to add comment: {e}")
-            raise Exception(f"Failed to add comment: {e}")
+        if isinstance(comment, str):
+            data = _COMMENT_ADF_PREFIX + _json_dumps(comment) + _COMMENT_ADF_SUFFIX
+            response = self._authed_request("POST", f"issue/{ticket_id}/comment", data=data)
+        else:
+            response = self._authed_request("POST", f"issue/{ticket_id}/comment", json={"body": comment})
+        self._forget_user_data(ticket_id)
+        return _check(response).json()
 
     def get_comments(self, ticket_id):
-        try:
-            access_token = self.get_token()
-            if not self.cloud_id:
-                resources = self.get_accessible_resources(access_token)
-                if resources and isinstance(resources, list) and 'id' in resources[0]:
-                    self.cloud_id = resources[0]['id']
-                else:
-                    raise Exception("Could not determine Jira cloud_id.")
-            url = f"{ATLASSIAN_API_BASE_URL}/ex/jira/{self.cloud_id}/rest/api/3/issue/{ticket_id}/comment"
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json"
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json().get('comments', [])
-        except Exception as e:
-            logger.error(f"Failed to get comments: {e}")
-            raise Exception(f"Failed to get comments: {e}")
+        return _json_loads(_check(self._authed_request("GET", f"issue/{ticket_id}/comment")).content).get('comments', [])
+
+    def get_comments_batch(self, ticket_ids, max_workers=8):
+        return self._fan_out(self.get_comments, ticket_ids, max_workers)
 
     def react_to_comment(self, comment_id, reaction):
         logger.warning("Jira Cloud API does not support comment reactions. This is a placeholder.")
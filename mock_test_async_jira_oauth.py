@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+import unittest
+import httpx
+from unittest.mock import patch, MagicMock, AsyncMock
+from AsyncJiraOAuth3LO import AsyncJiraOAuth3LO
+
+def mock_aio_response(payload):
+    response = MagicMock(status_code=200)
+    response.content = json.dumps(payload).encode()
+    return response
+
+class TestAsyncJiraOAuth3LO(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_redis = MagicMock()
+        self.jira = AsyncJiraOAuth3LO("client_id", "client_secret", "redirect_uri", redis_client=self.mock_redis)
+        self.jira.cloud_id = "cloud123"
+
+    def use_client(self, client):
+        self.jira._aio_client = client
+        self.jira._aio_loop = asyncio.get_running_loop()
+
+    @patch.object(AsyncJiraOAuth3LO, 'get_token')
+    async def test_get_tickets_bulk(self, mock_get_token):
+        mock_get_token.return_value = "dummy_token"
+        client = MagicMock(is_closed=False)
+        client.get = AsyncMock(side_effect=lambda url, headers: mock_aio_response({"key": url.rsplit("/", 1)[1]}))
+        self.use_client(client)
+        tickets = await self.jira.get_tickets_bulk(["PROJ-1", "PROJ-2"])
+        self.assertEqual([ticket["key"] for ticket in tickets], ["PROJ-1", "PROJ-2"])
+        mock_get_token.assert_called_once()
+        client.get.assert_any_call(
+            "https://api.atlassian.com/ex/jira/cloud123/rest/api/3/issue/PROJ-1",
+            headers={"Authorization": "Bearer dummy_token"}
+        )
+
+    @patch.object(AsyncJiraOAuth3LO, 'get_token')
+    async def test_get_ticket_async(self, mock_get_token):
+        mock_get_token.return_value = "dummy_token"
+        client = MagicMock(is_closed=False)
+        client.get = AsyncMock(return_value=mock_aio_response({"key": "PROJ-1"}))
+        self.use_client(client)
+        result = await self.jira.get_ticket_async("PROJ-1")
+        self.assertEqual(result["key"], "PROJ-1")
+
+    @patch.object(AsyncJiraOAuth3LO, 'get_token')
+    async def test_get_ticket_async_retries_once_on_401(self, mock_get_token):
+        mock_get_token.side_effect = ["stale", "fresh"]
+        self.jira._get_or_lock = MagicMock(return_value=["access_token", "fresh", "expires_at", str(int(time.time()) + 3600)])
+        rejected = MagicMock(status_code=401)
+        client = MagicMock(is_closed=False)
+        client.get = AsyncMock(side_effect=[rejected, mock_aio_response({"key": "PROJ-1"})])
+        self.use_client(client)
+        result = await self.jira.get_ticket_async("PROJ-1")
+        self.assertEqual(result["key"], "PROJ-1")
+        self.assertEqual(client.get.call_args.kwargs["headers"], {"Authorization": "Bearer fresh"})
+
+    @patch("AsyncJiraOAuth3LO.asyncio.sleep")
+    @patch.object(AsyncJiraOAuth3LO, 'get_token')
+    async def test_get_ticket_async_backs_off_on_rate_limit(self, mock_get_token, mock_sleep):
+        mock_get_token.return_value = "dummy_token"
+        limited = MagicMock(status_code=429, headers={"Retry-After": "3"})
+        unavailable = MagicMock(status_code=503, headers={})
+        client = MagicMock(is_closed=False)
+        client.get = AsyncMock(side_effect=[limited, unavailable, mock_aio_response({"key": "PROJ-1"})])
+        self.use_client(client)
+        result = await self.jira.get_ticket_async("PROJ-1")
+        self.assertEqual(result["key"], "PROJ-1")
+        self.assertEqual([c.args[0] for c in mock_sleep.await_args_list], [3, 0.5])
+
+    @patch.object(AsyncJiraOAuth3LO, 'get_token')
+    async def test_get_tickets_bulk_caps_concurrency(self, mock_get_token):
+        mock_get_token.return_value = "dummy_token"
+        in_flight = {"now": 0, "peak": 0}
+        async def get(url, headers):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return mock_aio_response({"key": url.rsplit("/", 1)[1]})
+        client = MagicMock(is_closed=False)
+        client.get = AsyncMock(side_effect=get)
+        self.use_client(client)
+        ticket_ids = [f"PROJ-{i}" for i in range(10)]
+        tickets = await self.jira.get_tickets_bulk(ticket_ids, max_concurrency=3)
+        self.assertEqual([ticket["key"] for ticket in tickets], ticket_ids)
+        self.assertEqual(in_flight["peak"], 3)
+
+    async def test_aio_client_is_reused_until_closed(self):
+        client = self.jira._get_aio_client()
+        self.assertIs(self.jira._get_aio_client(), client)
+        await self.jira.aclose()
+        self.assertTrue(client.is_closed)
+
+class TestAsyncClientAcrossEventLoops(unittest.TestCase):
+    @patch.object(AsyncJiraOAuth3LO, 'get_token', return_value="dummy_token")
+    def test_each_asyncio_run_gets_a_fresh_client(self, mock_get_token):
+        jira = AsyncJiraOAuth3LO("client_id", "client_secret", "redirect_uri", redis_client=MagicMock())
+        jira.cloud_id = "cloud123"
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"key": request.url.path.rsplit("/", 1)[1]}))
+        clients = []
+        async_client = httpx.AsyncClient
+        def build_client(**kwargs):
+            clients.append(async_client(transport=transport, **kwargs))
+            return clients[-1]
+        with patch("AsyncJiraOAuth3LO.httpx.AsyncClient", side_effect=build_client):
+            self.assertEqual(asyncio.run(jira.get_ticket_async("PROJ-1"))["key"], "PROJ-1")
+            self.assertEqual(asyncio.run(jira.get_ticket_async("PROJ-2"))["key"], "PROJ-2")
+        self.assertEqual(len(clients), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import redis
 import unittest
+import weakref
 from unittest.mock import patch, MagicMock
-from JiraOAuth3LO import JiraOAuth3LO, JiraAuthBase
+from JiraOAuth3LO import JiraAPIError, JiraOAuth3LO, JiraAuthBase
 
 class TestJiraOAuth3LO(unittest.TestCase):
     def setUp(self):
@@ -10,45 +12,312 @@ class TestJiraOAuth3LO(unittest.TestCase):
     def test_authbase_get_token(self):
         # Test JiraAuthBase authentication logic
         auth = JiraAuthBase("client_id", "client_secret", "redirect_uri", redis_client=self.mock_redis)
-        with patch.object(auth, 'load_token', return_value={"access_token": "abc"}):
+        with patch.object(JiraAuthBase, 'load_token', return_value={"access_token": "abc"}):
             token = auth.get_token()
             self.assertEqual(token, "abc")
 
-    @patch("JiraOAuth3LO.requests.post")
+    def test_instances_have_no_dict(self):
+        self.assertFalse(hasattr(self.jira, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.jira.unknown_attribute = 1
+        self.assertIs(weakref.ref(self.jira)(), self.jira)
+
+    def test_get_token_uses_in_process_cache(self):
+        import time
+        token = {"access_token": "abc", "expires_at": int(time.time()) + 3600}
+        with patch.object(JiraOAuth3LO, 'load_token', return_value=token) as mock_load_token:
+            self.assertEqual(self.jira.get_token(), "abc")
+            self.assertEqual(self.jira.get_token(), "abc")
+            mock_load_token.assert_called_once()
+
+    @patch.object(JiraOAuth3LO, 'load_token', return_value=None)
+    def test_get_token_refreshes_under_lock(self, mock_load_token):
+        self.jira._get_or_lock = MagicMock(return_value="LOCK")
+        self.jira._release_lock_script = MagicMock()
+        with patch.object(JiraOAuth3LO, 'refresh_token', return_value={"access_token": "new"}) as mock_refresh:
+            self.assertEqual(self.jira.get_token(), "new")
+            mock_refresh.assert_called_once()
+        lock_token = self.jira._get_or_lock.call_args.kwargs["args"][1]
+        self.jira._release_lock_script.assert_called_once_with(keys=["jira_oauth_refresh_lock"], args=[lock_token])
+
+    @patch("JiraOAuth3LO.time.sleep")
+    @patch.object(JiraOAuth3LO, 'load_token', return_value=None)
+    def test_get_token_waiter_takes_over_failed_refresh(self, mock_load_token, mock_sleep):
+        self.jira._get_or_lock = MagicMock(side_effect=["WAIT", "WAIT", "LOCK"])
+        self.jira._release_lock_script = MagicMock()
+        with patch.object(JiraOAuth3LO, 'refresh_token', return_value={"access_token": "new"}) as mock_refresh:
+            self.assertEqual(self.jira.get_token(), "new")
+            mock_refresh.assert_called_once()
+        self.assertEqual(self.jira._get_or_lock.call_count, 3)
+
+    @patch("JiraOAuth3LO.requests.Session.post")
+    def test_refresh_token_survives_access_token_expiry(self, mock_post):
+        self.mock_redis.hget.return_value = "refresh-1"
+        mock_post.return_value = MagicMock(status_code=200, json=lambda: {"access_token": "new", "expires_in": 3600})
+        token = self.jira.refresh_token()
+        self.assertEqual(mock_post.call_args.kwargs["json"]["refresh_token"], "refresh-1")
+        self.assertEqual(token["refresh_token"], "refresh-1")
+        pipe = self.mock_redis.pipeline.return_value
+        pipe.expire.assert_called_once_with("jira_oauth_token", 90 * 24 * 3600)
+
+    @patch.object(JiraOAuth3LO, 'load_token', return_value=None)
+    def test_get_token_uses_token_cached_by_another_worker(self, mock_load_token):
+        import time
+        reply = ["access_token", "other", "expires_at", str(int(time.time()) + 3600)]
+        self.jira._get_or_lock = MagicMock(return_value=reply)
+        with patch.object(JiraOAuth3LO, 'refresh_token') as mock_refresh:
+            self.assertEqual(self.jira.get_token(), "other")
+            mock_refresh.assert_not_called()
+
+    @patch("JiraOAuth3LO.requests.Session.request")
+    @patch.object(JiraOAuth3LO, 'get_token')
+    def test_authed_request_retries_once_on_401(self, mock_get_token, mock_request):
+        self.jira.cloud_id = "cloud123"
+        import time
+        self.jira._token_cache = ("stale", 0)
+        self.jira._get_or_lock = MagicMock(return_value=["access_token", "fresh", "expires_at", str(int(time.time()) + 3600)])
+        mock_get_token.side_effect = ["stale", "fresh"]
+        mock_request.side_effect = [MagicMock(status_code=401), MagicMock(status_code=200)]
+        response = self.jira._authed_request("GET", "myself")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.jira._token_cache[0], "fresh")
+        self.assertEqual(mock_request.call_args.kwargs["headers"], {"Authorization": "Bearer fresh"})
+
+    @patch("JiraOAuth3LO.requests.Session.request")
+    @patch.object(JiraOAuth3LO, 'get_token')
+    def test_authed_request_refreshes_when_redis_returns_rejected_token(self, mock_get_token, mock_request):
+        import time
+        self.jira.cloud_id = "cloud123"
+        self.jira._get_or_lock = MagicMock(return_value=["access_token", "revoked", "expires_at", str(int(time.time()) + 3600)])
+        mock_get_token.side_effect = ["revoked", "fresh"]
+        mock_request.side_effect = [MagicMock(status_code=401), MagicMock(status_code=200)]
+        with patch.object(JiraOAuth3LO, '_refresh_with_lock', return_value={"access_token": "fresh"}) as mock_refresh:
+            response = self.jira._authed_request("GET", "myself")
+            mock_refresh.assert_called_once()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_args.kwargs["headers"], {"Authorization": "Bearer fresh"})
+
+    @patch("JiraOAuth3LO.requests.Session.request")
+    @patch.object(JiraOAuth3LO, 'get_token', return_value="revoked")
+    def test_authed_request_gives_up_when_no_new_token_arrives(self, mock_get_token, mock_request):
+        import time
+        self.jira.cloud_id = "cloud123"
+        self.jira._refresh_lock_ttl = 0
+        self.jira._get_or_lock = MagicMock(return_value=["access_token", "revoked", "expires_at", str(int(time.time()) + 3600)])
+        mock_request.return_value = MagicMock(status_code=401)
+        with patch.object(JiraOAuth3LO, '_refresh_with_lock', return_value=None):
+            self.assertEqual(self.jira._authed_request("GET", "myself").status_code, 401)
+        mock_request.assert_called_once()
+
+    @patch("JiraOAuth3LO.requests.Session.request")
+    @patch.object(JiraOAuth3LO, 'get_token')
+    def test_concurrent_401s_wait_for_a_single_refresh(self, mock_get_token, mock_request):
+        import threading, time
+        ticket_ids = ["PROJ-1", "PROJ-2", "PROJ-3", "PROJ-4"]
+        self.jira.cloud_id = "cloud123"
+        state = {"token": "revoked"}
+        refresh_lock = threading.Lock()
+        all_rejected = threading.Barrier(len(ticket_ids), timeout=5)
+        mock_get_token.side_effect = lambda: state["token"]
+        self.jira._get_or_lock = MagicMock(side_effect=lambda keys, args: [
+            "access_token", state["token"], "expires_at", str(int(time.time()) + 3600)
+        ])
+
+        def refresh_with_lock():
+            # Only the first worker gets the lock; the others see it held, as with the Redis lock
+            if not refresh_lock.acquire(blocking=False):
+                return None
+            time.sleep(0.3)
+            state["token"] = "fresh"
+            return {"access_token": "fresh"}
+
+        def request(method, url, data, params, headers):
+            if headers["Authorization"] == "Bearer revoked":
+                all_rejected.wait()
+                return MagicMock(status_code=401)
+            return MagicMock(status_code=200, content=b'{"key": "%s"}' % url.rsplit("/", 1)[1].encode())
+        mock_request.side_effect = request
+
+        with patch.object(JiraOAuth3LO, '_refresh_with_lock', side_effect=refresh_with_lock) as mock_refresh:
+            tickets = self.jira.get_tickets(ticket_ids, max_workers=len(ticket_ids))
+        self.assertEqual([ticket["key"] for ticket in tickets], ticket_ids)
+        self.assertEqual(mock_request.call_count, 2 * len(ticket_ids))
+        self.assertGreaterEqual(mock_refresh.call_count, len(ticket_ids))
+
+    def test_default_redis_pool_is_shared(self):
+        first = JiraAuthBase("client_id", "client_secret", "redirect_uri", redis_host="redis.test")
+        second = JiraOAuth3LO("client_id", "client_secret", "redirect_uri", redis_host="redis.test")
+        self.assertIs(first.redis_client.connection_pool, second.redis_client.connection_pool)
+
+    @patch("JiraOAuth3LO.requests.Session.post")
     def test_call_token_api(self, mock_post):
         mock_response = MagicMock()
         mock_response.json.return_value = {"access_token": "abc", "refresh_token": "def"}
-        mock_response.raise_for_status = lambda: None
+        mock_response.status_code = 200
         mock_post.return_value = mock_response
 
         result = self.jira.call_token_api("dummy_code")
         self.assertEqual(result["access_token"], "abc")
+        self.assertEqual(mock_post.call_args.kwargs["timeout"], (3.05, 10))
         self.assertEqual(result["refresh_token"], "def")
 
-    @patch("JiraOAuth3LO.requests.get")
+    @patch("JiraOAuth3LO.requests.Session.get")
     def test_get_accessible_resources(self, mock_get):
         mock_response = MagicMock()
         mock_response.json.return_value = [{"id": "cloud123"}]
-        mock_response.raise_for_status = lambda: None
+        mock_response.status_code = 200
         mock_get.return_value = mock_response
 
         resources = self.jira.get_accessible_resources("dummy_token")
         self.assertEqual(resources[0]["id"], "cloud123")
         self.assertEqual(self.jira.cloud_id, "cloud123")
+        self.mock_redis.set.assert_called_with("jira_cloud_id", "cloud123")
+
+    def test_session_mounts_pooled_adapter(self):
+        auth_adapter = self.jira._session.get_adapter("https://auth.atlassian.com/oauth/token")
+        api_adapter = self.jira._session.get_adapter("https://api.atlassian.com/ex/jira/cloud123")
+        self.assertIn(429, api_adapter.max_retries.status_forcelist)
+        self.assertFalse(api_adapter.max_retries.raise_on_status)
+
+    def test_token_calls_fit_inside_the_refresh_lock(self):
+        from JiraOAuth3LO import _AUTH_TIMEOUT
+        retries = self.jira._session.get_adapter("https://auth.atlassian.com/oauth/token").max_retries
+        self.assertEqual(retries.read, 0)
+        self.assertFalse(retries.is_retry("POST", 429, has_retry_after=True))
+        connect_timeout, read_timeout = _AUTH_TIMEOUT
+        self.assertLess((retries.total + 1) * connect_timeout + read_timeout, self.jira._refresh_lock_ttl)
+
+    def test_post_is_retried_only_when_jira_asks(self):
+        from urllib3.exceptions import ReadTimeoutError
+        retries = self.jira._session.get_adapter("https://api.atlassian.com/ex/jira/cloud123").max_retries
+        self.assertTrue(retries.is_retry("GET", 502))
+        self.assertFalse(retries.is_retry("POST", 502))
+        self.assertFalse(retries.is_retry("POST", 429))
+        self.assertTrue(retries.is_retry("POST", 429, has_retry_after=True))
+        self.assertTrue(retries.is_retry("POST", 503, has_retry_after=True))
+        with self.assertRaises(ReadTimeoutError):
+            retries.increment("POST", "/rest/api/3/issue", error=ReadTimeoutError(None, "/rest/api/3/issue", "timed out"))
+
+    def test_refresher_starts_with_first_token_and_does_not_pin_client(self):
+        import gc, time
+        jira = JiraOAuth3LO("client_id", "client_secret", "redirect_uri", redis_client=self.mock_redis)
+        self.assertIsNone(jira._refresher)
+        jira._remember_token({"access_token": "abc", "expires_at": int(time.time()) + 3600})
+        refresher, stop = jira._refresher, jira._stop_refresh
+        self.assertTrue(refresher.is_alive())
+        client_ref = weakref.ref(jira)
+        del jira
+        gc.collect()
+        self.assertIsNone(client_ref())
+        self.assertTrue(stop.is_set())
+        refresher.join(1)
+        self.assertFalse(refresher.is_alive())
+
+    def test_injected_session_and_close(self):
+        session = MagicMock()
+        with JiraOAuth3LO("client_id", "client_secret", "redirect_uri", redis_client=self.mock_redis, session=session) as jira:
+            self.assertIs(jira._session, session)
+        self.assertTrue(jira._stop_refresh.is_set())
+        session.close.assert_not_called()
+
+        with patch.object(self.jira._session, 'close') as mock_close:
+            self.jira.close()
+            mock_close.assert_called_once()
+
+    @patch.object(JiraOAuth3LO, 'get_accessible_resources')
+    def test_ensure_cloud_id(self, mock_get_accessible_resources):
+        self.mock_redis.get.return_value = "cloud-from-redis"
+        self.assertEqual(self.jira._ensure_cloud_id("dummy_token"), "cloud-from-redis")
+        mock_get_accessible_resources.assert_not_called()
+
+        self.jira.cloud_id = None
+        self.mock_redis.get.return_value = None
+        def fetch(access_token):
+            self.jira.cloud_id = "cloud123"
+        mock_get_accessible_resources.side_effect = fetch
+        self.assertEqual(self.jira._ensure_cloud_id("dummy_token"), "cloud123")
+        mock_get_accessible_resources.assert_called_once_with("dummy_token")
+
+    @patch("JiraOAuth3LO.requests.Session.request")
+    @patch.object(JiraOAuth3LO, 'get_token')
+    def test_authed_request_rebuilds_cache_on_change(self, mock_get_token, mock_request):
+        self.jira.cloud_id = "cloud123"
+        mock_get_token.return_value = "token1"
+        self.jira._authed_request("GET", "myself")
+        mock_get_token.return_value = "token2"
+        self.jira.cloud_id = "cloud456"
+        self.jira._authed_request("GET", "myself")
+        mock_request.assert_called_with(
+            "GET", "https://api.atlassian.com/ex/jira/cloud456/rest/api/3/myself",
+            data=None, params=None, headers={"Authorization": "Bearer token2"}
+        )
+
+    @patch("JiraOAuth3LO.requests.Session.request")
+    @patch.object(JiraOAuth3LO, 'get_token')
+    def test_authed_request_logs_timing_at_debug(self, mock_get_token, mock_request):
+        self.jira.cloud_id = "cloud123"
+        mock_get_token.return_value = "dummy_token"
+        mock_request.return_value = MagicMock(status_code=200)
+        with self.assertLogs("JiraOAuth3LO", level="DEBUG") as logs:
+            self.jira._authed_request("GET", "myself")
+        self.assertIn("Jira GET myself -> 200", logs.output[0])
 
     def test_cache_and_load_token(self):
+        import time
+        token = {"access_token": "abc", "refresh_token": "def", "expires_at": str(int(time.time()) + 3600)}
+        pipe = self.mock_redis.pipeline.return_value
+        pipe.execute.return_value = [token, "cloud123"]
+        loaded = self.jira.load_token()
+        self.assertEqual(loaded["access_token"], "abc")
+        self.assertIsInstance(loaded["expires_at"], int)
+        self.assertEqual(self.jira.cloud_id, "cloud123")
+        pipe.hgetall.assert_called_once_with("jira_oauth_token")
+        pipe.get.assert_called_once_with("jira_cloud_id")
+
+    def test_load_token_migrates_legacy_json(self):
         import json, time
         token = {"access_token": "abc", "refresh_token": "def", "expires_at": int(time.time()) + 3600}
+        auth = JiraAuthBase("client_id", "client_secret", "redirect_uri", redis_client=self.mock_redis)
+        self.mock_redis.hgetall.side_effect = [redis.ResponseError("WRONGTYPE"), {k: str(v) for k, v in token.items()}]
         self.mock_redis.get.return_value = json.dumps(token)
-        loaded = self.jira.load_token()
-        self.assertEqual(loaded["access_token"], "abc")
+        self.mock_redis.ttl.return_value = 1200
+        self.assertEqual(auth.load_token()["access_token"], "abc")
+        pipe = self.mock_redis.pipeline.return_value
+        pipe.hset.assert_called_once_with("jira_oauth_token", mapping=token)
+        pipe.expire.assert_called_once_with("jira_oauth_token", 90 * 24 * 3600)
+
+    def test_refresh_with_lock(self):
+        self.mock_redis.set.return_value = True
+        self.jira._release_lock_script = MagicMock()
+        with patch.object(JiraOAuth3LO, 'refresh_token', return_value={"access_token": "new"}) as mock_refresh:
+            self.assertEqual(self.jira._refresh_with_lock(), {"access_token": "new"})
+            mock_refresh.assert_called_once()
+        lock_token = self.mock_redis.set.call_args.args[1]
+        self.jira._release_lock_script.assert_called_once_with(keys=["jira_oauth_refresh_lock"], args=[lock_token])
+        self.mock_redis.delete.assert_not_called()
+
+        self.mock_redis.set.return_value = None
+        with patch.object(JiraOAuth3LO, 'refresh_token') as mock_refresh:
+            self.assertIsNone(self.jira._refresh_with_lock())
+            mock_refresh.assert_not_called()
 
     def test_cache_token_to_redis(self):
-        token = {"access_token": "abc"}
+        token = {"access_token": "abc", "scope": None}
         self.jira.cache_token_to_redis(token, 3600)
-        self.mock_redis.set.assert_called()
+        pipe = self.mock_redis.pipeline.return_value
+        pipe.hset.assert_called_once_with("jira_oauth_token", mapping={"access_token": "abc", "expires_at": token["expires_at"]})
+        pipe.expire.assert_called_once_with("jira_oauth_token", 3600)
+        pipe.execute.assert_called_once()
+        self.mock_redis.pipeline.assert_called_with(transaction=True)
+        pipe.set.assert_not_called()
 
-    @patch("JiraOAuth3LO.requests.post")
+        self.jira.cloud_id = "cloud123"
+        self.jira.cache_token_to_redis({"access_token": "abc"}, 3600)
+        pipe.set.assert_called_once_with("jira_cloud_id", "cloud123")
+        self.assertEqual(pipe.execute.call_count, 2)
+        self.mock_redis.set.assert_not_called()
+
+    @patch("JiraOAuth3LO.requests.Session.request")
     @patch.object(JiraOAuth3LO, 'get_accessible_resources')
     @patch.object(JiraOAuth3LO, 'get_token')
     def test_create_ticket(self, mock_get_token, mock_get_accessible_resources, mock_post):
@@ -66,7 +335,7 @@ class TestJiraOAuth3LO(unittest.TestCase):
         result = self.jira.create_ticket(data)
         self.assertEqual(result["key"], "PROJ-1")
 
-    @patch("JiraOAuth3LO.requests.put")
+    @patch("JiraOAuth3LO.requests.Session.request")
     @patch.object(JiraOAuth3LO, 'get_accessible_resources')
     @patch.object(JiraOAuth3LO, 'get_token')
     def test_update_ticket(self, mock_get_token, mock_get_accessible_resources, mock_put):
@@ -77,7 +346,7 @@ class TestJiraOAuth3LO(unittest.TestCase):
         result = self.jira.update_ticket("PROJ-1", data)
         self.assertTrue(result)
 
-    @patch("JiraOAuth3LO.requests.delete")
+    @patch("JiraOAuth3LO.requests.Session.request")
     @patch.object(JiraOAuth3LO, 'get_accessible_resources')
     @patch.object(JiraOAuth3LO, 'get_token')
     def test_delete_ticket(self, mock_get_token, mock_get_accessible_resources, mock_delete):
@@ -87,28 +356,55 @@ class TestJiraOAuth3LO(unittest.TestCase):
         result = self.jira.delete_ticket("PROJ-1")
         self.assertTrue(result)
 
-    @patch("JiraOAuth3LO.requests.get")
+    @patch("JiraOAuth3LO.requests.Session.request")
+    @patch.object(JiraOAuth3LO, 'get_accessible_resources')
+    @patch.object(JiraOAuth3LO, 'get_token')
+    def test_get_ticket_raises_jira_api_error(self, mock_get_token, mock_get_accessible_resources, mock_get):
+        mock_get_token.return_value = "dummy_token"
+        self.jira.cloud_id = "cloud123"
+        mock_get.return_value = MagicMock(status_code=404, text='{"errorMessages": ["Issue does not exist"]}')
+        with self.assertRaises(JiraAPIError) as ctx:
+            self.jira.get_ticket("PROJ-404")
+        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertIn("Issue does not exist", ctx.exception.body)
+
+    @patch("JiraOAuth3LO.requests.Session.request")
     @patch.object(JiraOAuth3LO, 'get_accessible_resources')
     @patch.object(JiraOAuth3LO, 'get_token')
     def test_get_ticket(self, mock_get_token, mock_get_accessible_resources, mock_get):
         mock_get_token.return_value = "dummy_token"
         self.jira.cloud_id = "cloud123"
-        mock_get.return_value = MagicMock(status_code=200, json=lambda: {"key": "PROJ-1"}, raise_for_status=lambda: None)
+        mock_get.return_value = MagicMock(status_code=200, content=b'{"key": "PROJ-1"}', raise_for_status=lambda: None)
         result = self.jira.get_ticket("PROJ-1")
         self.assertEqual(result["key"], "PROJ-1")
+        mock_get.assert_called_once_with(
+            "GET", "https://api.atlassian.com/ex/jira/cloud123/rest/api/3/issue/PROJ-1",
+            data=None, params=None, headers={"Authorization": "Bearer dummy_token"}
+        )
 
-    @patch("JiraOAuth3LO.requests.get")
+    @patch("JiraOAuth3LO.requests.Session.request")
     @patch.object(JiraOAuth3LO, 'get_accessible_resources')
     @patch.object(JiraOAuth3LO, 'get_token')
     def test_list_tickets(self, mock_get_token, mock_get_accessible_resources, mock_get):
         mock_get_token.return_value = "dummy_token"
         self.jira.cloud_id = "cloud123"
-        mock_get.return_value = MagicMock(status_code=200, json=lambda: {"issues": [{"key": "PROJ-1"}, {"key": "PROJ-2"}]}, raise_for_status=lambda: None)
+        mock_get.return_value = MagicMock(status_code=200, content=b'{"issues": [{"key": "PROJ-1"}, {"key": "PROJ-2"}]}', raise_for_status=lambda: None)
         result = self.jira.list_tickets("PROJ")
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0]["key"], "PROJ-1")
 
-    @patch("JiraOAuth3LO.requests.get")
+    @patch.object(JiraOAuth3LO, '_search')
+    def test_iter_tickets(self, mock_search):
+        mock_search.side_effect = [
+            {"issues": [{"key": "PROJ-1"}, {"key": "PROJ-2"}], "total": 3},
+            {"issues": [{"key": "PROJ-3"}], "total": 3}
+        ]
+        pages = list(self.jira.iter_tickets("PROJ", fields=("summary", "status"), max_results=2))
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual(mock_search.call_count, 2)
+        self.assertEqual(mock_search.call_args_list[1].args, ("PROJ", None, ("summary", "status"), 2, 2))
+
+    @patch("JiraOAuth3LO.requests.Session.request")
     @patch.object(JiraOAuth3LO, 'get_accessible_resources')
     @patch.object(JiraOAuth3LO, 'get_token')
     def test_list_projects(self, mock_get_token, mock_get_accessible_resources, mock_get):
@@ -116,10 +412,10 @@ class TestJiraOAuth3LO(unittest.TestCase):
         self.jira.cloud_id = "cloud123"
         mock_get.return_value = MagicMock(
             status_code=200,
-            json=lambda: {"values": [
+            content=b'''{"values": [
                 {"key": "PROJ1", "name": "Project 1"},
                 {"key": "PROJ2", "name": "Project 2"}
-            ]},
+            ]}''',
             raise_for_status=lambda: None
         )
         projects = self.jira.list_projects()
@@ -142,7 +438,58 @@ class TestJiraOAuth3LO(unittest.TestCase):
         self.assertIn("john.doe", user_data["mentions"])
         self.assertIn("jane.smith", user_data["mentions"])
 
-    @patch("JiraOAuth3LO.requests.post")
+    def test_extract_user_data_adf(self):
+        mention = lambda text: {"type": "mention", "attrs": {"id": text, "text": text}}
+        ticket = {
+            "fields": {
+                "description": {"type": "doc", "version": 1, "content": [
+                    {"type": "paragraph", "content": [{"type": "text", "text": "cc "}, mention("@alice")]},
+                    {"type": "bulletList", "content": [
+                        {"type": "listItem", "content": [{"type": "paragraph", "content": [mention("@bob")]}]}
+                    ]}
+                ]},
+                "comment": {"comments": [
+                    {"body": {"type": "doc", "version": 1, "content": [{"type": "paragraph", "content": [mention("@carol")]}]}}
+                ]}
+            }
+        }
+        user_data = self.jira.extract_user_data(ticket)
+        self.assertCountEqual(user_data["mentions"], ["@alice", "@bob", "@carol"])
+
+    def test_extract_user_data_skips_cache_for_projected_tickets(self):
+        updated = "2024-01-01T00:00:00.000+0000"
+        projected = {"id": "10001", "key": "PROJ-1", "fields": {"summary": "Bug", "updated": updated}}
+        full = {"id": "10001", "key": "PROJ-1", "fields": {
+            "updated": updated, "summary": "Bug", "assignee": {"displayName": "John Doe"}, "reporter": None,
+            "description": "Hi @john.doe", "comment": {"comments": []}
+        }}
+        self.assertIsNone(self.jira.extract_user_data(projected)["assignee"])
+        user_data = self.jira.extract_user_data(full)
+        self.assertEqual(user_data["assignee"], "John Doe")
+        self.assertEqual(user_data["mentions"], ["john.doe"])
+
+    @patch("JiraOAuth3LO.requests.Session.request")
+    @patch.object(JiraOAuth3LO, 'get_accessible_resources')
+    @patch.object(JiraOAuth3LO, 'get_token')
+    def test_extract_user_data_is_memoized(self, mock_get_token, mock_get_accessible_resources, mock_request):
+        mock_get_token.return_value = "dummy_token"
+        self.jira.cloud_id = "cloud123"
+        ticket = {"id": "10001", "key": "PROJ-1", "fields": {
+            "updated": "2024-01-01T00:00:00.000+0000", "assignee": None, "reporter": None,
+            "description": "Hi @john.doe", "comment": {"comments": []}
+        }}
+        with patch.object(JiraOAuth3LO, '_extract_user_data', wraps=self.jira._extract_user_data) as mock_extract:
+            first = self.jira.extract_user_data(ticket)
+            first["mentions"].append("mutated")
+            second = self.jira.extract_user_data(ticket)
+            self.assertEqual(mock_extract.call_count, 1)
+            self.assertEqual(second["mentions"], ["john.doe"])
+            mock_request.return_value = MagicMock(status_code=201, json=lambda: {"id": "1"}, raise_for_status=lambda: None)
+            self.jira.add_comment("PROJ-1", "Test comment")
+            self.jira.extract_user_data(ticket)
+            self.assertEqual(mock_extract.call_count, 2)
+
+    @patch("JiraOAuth3LO.requests.Session.request")
     @patch.object(JiraOAuth3LO, 'get_accessible_resources')
     @patch.object(JiraOAuth3LO, 'get_token')
     def test_add_comment(self, mock_get_token, mock_get_accessible_resources, mock_post):
@@ -151,18 +498,38 @@ class TestJiraOAuth3LO(unittest.TestCase):
         mock_post.return_value = MagicMock(status_code=201, json=lambda: {"id": "10001", "body": {"content": []}}, raise_for_status=lambda: None)
         result = self.jira.add_comment("PROJ-1", "Test comment")
         self.assertEqual(result["id"], "10001")
+        self.assertEqual(
+            mock_post.call_args.kwargs["headers"],
+            {"Authorization": "Bearer dummy_token", "Content-Type": "application/json"}
+        )
+        import json
+        self.assertEqual(json.loads(mock_post.call_args.kwargs["data"]), {"body": {
+            "type": "doc",
+            "version": 1,
+            "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Test comment"}]}]
+        }})
 
-    @patch("JiraOAuth3LO.requests.get")
+    @patch("JiraOAuth3LO.requests.Session.request")
     @patch.object(JiraOAuth3LO, 'get_accessible_resources')
     @patch.object(JiraOAuth3LO, 'get_token')
     def test_get_comments(self, mock_get_token, mock_get_accessible_resources, mock_get):
         mock_get_token.return_value = "dummy_token"
         self.jira.cloud_id = "cloud123"
-        mock_get.return_value = MagicMock(status_code=200, json=lambda: {"comments": [{"id": "10001", "body": {"content": []}}]}, raise_for_status=lambda: None)
+        mock_get.return_value = MagicMock(status_code=200, content=b'{"comments": [{"id": "10001", "body": {"content": []}}]}', raise_for_status=lambda: None)
         comments = self.jira.get_comments("PROJ-1")
         self.assertEqual(len(comments), 1)
         self.assertEqual(comments[0]["id"], "10001")
 
+    @patch.object(JiraOAuth3LO, '_prepare_request')
+    def test_batch_reads(self, mock_prepare_request):
+        with patch.object(JiraOAuth3LO, 'get_ticket', side_effect=lambda ticket_id: {"key": ticket_id}):
+            tickets = self.jira.get_tickets(["PROJ-1", "PROJ-2", "PROJ-3"], max_workers=2)
+        self.assertEqual([ticket["key"] for ticket in tickets], ["PROJ-1", "PROJ-2", "PROJ-3"])
+        with patch.object(JiraOAuth3LO, 'get_comments', side_effect=lambda ticket_id: [{"id": ticket_id}]):
+            comments = self.jira.get_comments_batch(["PROJ-1", "PROJ-2"])
+        self.assertEqual(comments, [[{"id": "PROJ-1"}], [{"id": "PROJ-2"}]])
+        self.assertEqual(mock_prepare_request.call_count, 2)
+
     def test_react_to_comment(self):
         with self.assertRaises(NotImplementedError):
             self.jira.react_to_comment("10001", ":thumbsup:")